@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
 from typing import List
 from app.core.clients import meili_client
@@ -7,39 +8,49 @@ from app.services.embeddings import generate_embeddings
 
 router = APIRouter()
 
+def _configure_index(uid: str, index_settings: dict):
+    """Create the index if missing, then apply all of its settings as a single task."""
+    try:
+        idx = meili_client.get_index(uid)
+    except Exception:
+        meili_client.create_index(uid, {"primaryKey": "id"})
+        idx = meili_client.index(uid)
+    return idx.update_settings(index_settings)
+
+
+def _embedder_settings() -> dict:
+    embedder = {"source": "userProvided", "dimensions": settings.EMBED_DIM}
+    if settings.MEILI_BINARY_QUANTIZED:
+        # Meilisearch rejects switching this back off, so only ever send it when enabled
+        embedder["binaryQuantized"] = True
+    return embedder
+
+
 @router.post("/init-index")
 async def init_index():
     """Create/Configure Meilisearch indices incl. userProvided vectors."""
     try:
-        # documents index
-        try:
-            doc_idx = meili_client.get_index(settings.MEILI_INDEX)
-        except Exception:
-            doc_idx = meili_client.create_index(settings.MEILI_INDEX, {"primaryKey": "id"})
-        doc_idx.update_searchable_attributes(["text", "title", "content"])
-        doc_idx.update_filterable_attributes(["category", "tags", "author", "source"])
-
-        # chunks index
-        try:
-            chunks_idx = meili_client.get_index(settings.CHUNKS_INDEX)
-        except Exception:
-            chunks_idx = meili_client.create_index(settings.CHUNKS_INDEX, {"primaryKey": "id"})
-        chunks_idx.update_searchable_attributes(["text", "title", "content"])
-        chunks_idx.update_filterable_attributes(["document_id", "category", "tags", "chunk_index"])
-        chunks_idx.update_settings({
-            "embedders": {
-                "default": {"source": "userProvided", "dimensions": settings.EMBED_DIM}
-            }
-        })
+        # documents + chunks indexes, configured concurrently (the meilisearch client is sync)
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(asyncio.to_thread(_configure_index, settings.MEILI_INDEX, {
+                "searchableAttributes": ["text", "title"],
+                "filterableAttributes": ["category", "tags", "author", "source"],
+            }))
+            tg.create_task(asyncio.to_thread(_configure_index, settings.CHUNKS_INDEX, {
+                "searchableAttributes": ["text", "title"],
+                "filterableAttributes": ["document_id", "category", "tags", "chunk_index"],
+                "embedders": {"default": _embedder_settings()},
+            }))
+    except* Exception as eg:
+        detail = "; ".join(str(e) for e in eg.exceptions)
+        logger.error(f"init-index failed: {detail}")
+        raise HTTPException(status_code=500, detail=detail)
 
-        return {
-            "message": "Indexes initialized successfully with embeddings support",
-            "indexes": [settings.MEILI_INDEX, settings.CHUNKS_INDEX],
-            "embedding_dimensions": settings.EMBED_DIM,
-        }
-    except Exception as e:
-        logger.error(f"init-index failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "message": "Indexes initialized successfully with embeddings support",
+        "indexes": [settings.MEILI_INDEX, settings.CHUNKS_INDEX],
+        "embedding_dimensions": settings.EMBED_DIM,
+    }
 
 
 @router.post("/test-embeddings")
@@ -1,22 +1,31 @@
+import time
 from fastapi import APIRouter
 from app.models.health import HealthResponse
 from app.core.config import settings
 from app.core.logging import logger
-from app.services.embeddings import generate_embeddings
+from app.services.embeddings import probe_embeddings
 
 router = APIRouter()
 
+_HEALTH_TTL = 5.0  # seconds; caps embedding probes from liveness checks at one per TTL
+_health_cache = {"checked_at": float("-inf"), "ok": False}
+
 @router.get("/health", response_model=HealthResponse)
-async def health() -> HealthResponse:
-    try:
-        vecs = await generate_embeddings(["test"])
-        ok = len(vecs) > 0 and len(vecs[0]) == settings.EMBED_DIM
-    except Exception as e:
-        logger.warning(f"Health embeddings check failed: {e}")
-        ok = False
+async def health():
+    now = time.monotonic()
+    if now - _health_cache["checked_at"] >= _HEALTH_TTL:
+        try:
+            # Straight to TEI: the embedding caches would keep answering through an outage
+            vec = await probe_embeddings()
+            ok = vec is not None and len(vec) == settings.EMBED_DIM
+        except Exception as e:
+            logger.warning(f"Health embeddings check failed: {e}")
+            ok = False
+        _health_cache.update(checked_at=now, ok=ok)
+    ok = _health_cache["ok"]
 
-    return HealthResponse(
-        status="healthy",
-        embeddings_available=ok,
-        embedding_dimensions=settings.EMBED_DIM if ok else None,
-    )
+    return {
+        "status": "healthy",
+        "embeddings_available": ok,
+        "embedding_dimensions": settings.EMBED_DIM if ok else None,
+    }
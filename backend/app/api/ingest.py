@@ -1,11 +1,26 @@
-from fastapi import APIRouter, HTTPException
-from app.models.documents import Document
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from app.models.documents import Document, DocumentList
 from app.services.ingestion import ingest_documents
 
 router = APIRouter()
 
-@router.post("/ingest")
-async def ingest_route(docs: list[Document]):
+# The body is read raw and parsed by DocumentList, so the schema is declared by hand for the docs
+_INGEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": {"type": "array", "items": Document.model_json_schema()}}},
+    }
+}
+
+@router.post("/ingest", openapi_extra=_INGEST_BODY)
+async def ingest_route(request: Request):
+    try:
+        docs = DocumentList.validate_json(await request.body())
+    except ValidationError as e:
+        # Same shape as FastAPI's own body errors: locations are prefixed with "body"
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)])
     try:
         return await ingest_documents(docs)
     except Exception as e:
@@ -1,49 +1,122 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.pdf_processor import PDFProcessor
+from app.services.pdf_processor import pdf_processor
 from app.services.ingestion import ingest_documents
 from app.models.documents import Document  # 👈 your pipeline model
-import tempfile, os, logging
-from typing import Optional
+from app.core.config import settings
+from app.core.logging import logger
+import aiofiles.os
+import aiofiles.tempfile
+import asyncio, contextlib, io, os, tempfile
+from typing import BinaryIO, Optional
+from starlette.formparsers import MultiPartParser
 
 router = APIRouter()
-logger = logging.getLogger(__name__)
-pdf_processor = PDFProcessor()
+
+_UPLOAD_CHUNK = 1024 * 1024  # stream uploads to disk 1MB at a time
+
+
+def _too_large_detail() -> str:
+    return f"PDF exceeds the {settings.MAX_UPLOAD_BYTES // (1024 * 1024)}MB upload limit"
+
+
+def _sendfile_copy(src_fd: int, dst_fd: int, size: int) -> None:
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        if not sent:
+            break
+        offset += sent
+
+
+def _spilled_to_disk(file: UploadFile) -> bool:
+    """Starlette keeps an upload in memory up to MultiPartParser.max_file_size, then rolls it to disk."""
+    return file.size is not None and file.size > MultiPartParser.max_file_size
+
+
+async def _copy_rolled_upload(spooled: BinaryIO) -> str:
+    """Copy an upload Starlette already spilled to disk without passing it through Python.
+
+    The rolled-over file is an anonymous TemporaryFile, so it can't be renamed into place.
+    Raises io.UnsupportedOperation if the upload isn't backed by a real file descriptor.
+    """
+    src_fd = spooled.fileno()
+    size = os.fstat(src_fd).st_size
+    if size > settings.MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=_too_large_detail())
+    dst_fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        await asyncio.to_thread(_sendfile_copy, src_fd, dst_fd, size)
+    except BaseException:
+        os.close(dst_fd)
+        os.remove(tmp_path)
+        raise
+    os.close(dst_fd)
+    return tmp_path
+
+
+async def _spool_upload(file: UploadFile) -> str:
+    """Stream an upload into a temp file without buffering it in memory."""
+    if hasattr(os, "sendfile") and _spilled_to_disk(file):
+        try:
+            return await _copy_rolled_upload(file.file)
+        except io.UnsupportedOperation:
+            pass  # no usable fd after all; stream it below
+
+    async with aiofiles.tempfile.NamedTemporaryFile("wb", delete=False, suffix=".pdf") as tmp_file:
+        total = 0
+        try:
+            while chunk := await file.read(_UPLOAD_CHUNK):
+                total += len(chunk)
+                if total > settings.MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail=_too_large_detail())
+                await tmp_file.write(chunk)
+        except BaseException:
+            await aiofiles.os.remove(tmp_file.name)
+            raise
+        return tmp_file.name
+
 
 @router.post("/ingest-pdf")
 async def ingest_pdf(file: UploadFile = File(...), metadata: Optional[dict] = None):
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files supported")
-    
+    if file.size is not None and file.size > settings.MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=_too_large_detail())
+
+    tmp_path = None
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        tmp_path = await _spool_upload(file)
 
         # Process into LangChain Documents
         lc_documents = await pdf_processor.process_pdf(tmp_path, metadata)
 
-        # Convert LangChain Document -> RagopsDocument
-        ragops_docs = [
-            Document(
-                id=doc.metadata["chunk_id"],       # unique id
+        # Convert LangChain Document -> RagopsDocument, tracking the last page in the same pass
+        ragops_docs, pages_processed = [], 0
+        for doc in lc_documents:
+            meta = doc.metadata
+            ragops_docs.append(Document(
+                id=meta["chunk_id"],               # unique id
                 text=doc.page_content,             # full text chunk
-                metadata=doc.metadata              # dict of extra metadata
-            )
-            for doc in lc_documents
-        ]
+                metadata=meta                      # dict of extra metadata
+            ))
+            if meta["page_number"] > pages_processed:
+                pages_processed = meta["page_number"]
 
         result = await ingest_documents(ragops_docs)
 
-        os.unlink(tmp_path)
-
         return {
             "filename": file.filename,
-            "pages_processed": max(doc.metadata["page_number"] for doc in lc_documents),
-            "chunks_created": len(lc_documents),
+            "pages_processed": pages_processed,
+            "chunks_created": len(ragops_docs),
             **result
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"PDF ingestion failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"PDF processing failed: {str(e)}")
+    finally:
+        if tmp_path:
+            with contextlib.suppress(FileNotFoundError):
+                await aiofiles.os.remove(tmp_path)
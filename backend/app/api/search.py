@@ -10,7 +10,8 @@ async def search_direct(req: SearchRequest):
     if not req.query or req.k <= 0:
         raise HTTPException(422, "Invalid query or k")
     res = await search_documents(req.query, req.k)
-    return DirectSearchResult(**res, query=req.query)
+    # Plain dicts are validated once by response_model instead of being built, dumped and revalidated
+    return {**res, "query": req.query}
 
 @router.post("/search-chunks")
 async def search_chunks_route(req: SearchRequest):
@@ -22,5 +23,4 @@ async def search_chunks_route(req: SearchRequest):
 async def rag_route(req: SearchRequest):
     if not req.query or req.k <= 0:
         raise HTTPException(422, "Invalid query or k")
-    res = await rag_search(req.query, req.k, req.use_embeddings)
-    return SearchResponse(**res)
+    return await rag_search(req.query, req.k, req.use_embeddings)
@@ -1,32 +1,73 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, HTTPException
-from app.core.clients import meili_client
+from app.core.clients import get_index
 from app.core.config import settings
 from app.core.logging import logger
 
 router = APIRouter()
 
+
+def _index_stats(uid: str):
+    # IndexStats exposes the Meilisearch fields as snake_case attributes, not dict keys
+    return get_index(uid).get_stats()
+
+
+_stats_cache: Optional[Dict[str, Any]] = None
+_stats_fetched_at = float("-inf")  # time.monotonic() of the last successful fetch
+_STALE_AFTER_REFRESHES = 3  # snapshot older than this many refresh periods is not served
+
+
+async def _fetch_stats() -> Dict[str, Any]:
+    doc_stats, chk_stats = await asyncio.gather(
+        asyncio.to_thread(_index_stats, settings.MEILI_INDEX),
+        asyncio.to_thread(_index_stats, settings.CHUNKS_INDEX),
+    )
+
+    return {
+        "documents": {
+            "count": getattr(doc_stats, "number_of_documents", None),
+            "size": getattr(doc_stats, "raw_document_db_size", None),
+            "indexing": getattr(doc_stats, "is_indexing", None),
+        },
+        "chunks": {
+            "count": getattr(chk_stats, "number_of_documents", None),
+            "size": getattr(chk_stats, "raw_document_db_size", None),
+            "indexing": getattr(chk_stats, "is_indexing", None),
+            "embeddings": getattr(chk_stats, "number_of_embedded_documents", None),
+        },
+    }
+
+
+async def _refresh_stats() -> Dict[str, Any]:
+    global _stats_cache, _stats_fetched_at
+    _stats_cache = await _fetch_stats()
+    _stats_fetched_at = time.monotonic()
+    return _stats_cache
+
+
+async def refresh_stats_loop() -> None:
+    """Keep the /stats snapshot fresh so scrapes never wait on Meilisearch."""
+    while True:
+        try:
+            await _refresh_stats()
+        except Exception as e:
+            logger.warning(f"stats refresh failed: {e}")
+        await asyncio.sleep(settings.STATS_REFRESH_SECONDS)
+
+
 @router.get("/stats")
 async def stats():
+    age = time.monotonic() - _stats_fetched_at
+    if _stats_cache is not None and age <= _STALE_AFTER_REFRESHES * settings.STATS_REFRESH_SECONDS:
+        return _stats_cache
+    # No snapshot yet, or background refreshes have been failing: fetch inline
     try:
-        doc_idx = meili_client.get_index(settings.MEILI_INDEX)
-        chk_idx = meili_client.get_index(settings.CHUNKS_INDEX)
-
-        doc_stats = doc_idx.get_stats()   # Meilisearch returns dicts here
-        chk_stats = chk_idx.get_stats()
-
-        return {
-            "documents": {
-                "count": doc_stats.get("numberOfDocuments"),
-                "size": doc_stats.get("rawDocumentDbSize"),
-                "indexing": doc_stats.get("isIndexing"),
-            },
-            "chunks": {
-                "count": chk_stats.get("numberOfDocuments"),
-                "size": chk_stats.get("rawDocumentDbSize"),
-                "indexing": chk_stats.get("isIndexing"),
-                "embeddings": chk_stats.get("numberOfEmbeddedDocuments"),
-            },
-        }
+        return await _refresh_stats()
     except Exception as e:
         logger.error(f"stats failed: {e}")
+        if _stats_cache is not None:
+            # Only a stale snapshot left: say so rather than serving it as current
+            raise HTTPException(status_code=503, detail=f"Stats unavailable, last refresh {age:.0f}s ago: {e}")
         raise HTTPException(status_code=500, detail=str(e))
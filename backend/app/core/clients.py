@@ -1,6 +1,24 @@
+import httpx
 import meilisearch
-import redis
+import redis.asyncio as aioredis
+from functools import lru_cache
+from meilisearch.index import Index
 from .config import settings
 
 meili_client = meilisearch.Client(settings.MEILI_URL, settings.MEILI_KEY)
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True, max_connections=64)
+# Raw-bytes client for binary payloads (packed embedding vectors)
+redis_bytes_client = aioredis.from_url(settings.REDIS_URL, decode_responses=False, max_connections=64)
+
+# One pooled client for LiteLLM calls (embeddings + chat) so requests reuse keep-alive connections
+http_client = httpx.AsyncClient(
+    base_url=settings.PROXY_URL,
+    limits=httpx.Limits(max_keepalive_connections=40, max_connections=200, keepalive_expiry=30),
+    timeout=httpx.Timeout(60.0, connect=5.0),
+)
+
+
+@lru_cache(maxsize=8)
+def get_index(uid: str) -> Index:
+    """Index handle, fetched from Meilisearch once per process instead of per request."""
+    return meili_client.get_index(uid)
@@ -13,6 +13,15 @@ class Settings:
     MEILI_INDEX: str = os.getenv("MEILI_INDEX", "documents")
     CHUNKS_INDEX: str = "chunks"
     EMBED_DIM: int = int(os.getenv("EMBED_DIM", "384"))
+    # Store chunk vectors 1 bit/dim in Meilisearch (irreversible once applied to an index)
+    MEILI_BINARY_QUANTIZED: bool = os.getenv("MEILI_BINARY_QUANTIZED", "false").lower() == "true"
+    # Redis embedding cache encoding: "f32" (lossless) or "int8" (per-vector scale, ~4x smaller)
+    EMBED_QUANT: str = os.getenv("EMBED_QUANT", "f32").lower()
+
+    MAX_UPLOAD_BYTES: int = int(os.getenv("MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+    STATS_REFRESH_SECONDS: float = float(os.getenv("STATS_REFRESH_SECONDS", "10"))
+    # Chunks per Meilisearch add_documents request during ingestion (batches are sent concurrently)
+    INGEST_BATCH_SIZE: int = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
 
     # LLM and Embeddings settings for RAGAS evaluation
     LITELLM_MODEL: str = os.environ["LITELLM_MODEL"]  # Model name matching litellm config
@@ -1,8 +1,19 @@
+import asyncio
+import contextlib
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+from app.core.clients import get_index, http_client, redis_bytes_client, redis_client
 from app.core.config import settings
+from app.core.logging import logger
 from app.api import health, ingest, search, chat, stats, embeddings, pdf
+from app.services.embed_batcher import embedder
+from app.services.pdf_processor import pdf_processor, shutdown_process_pool
 
-app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION)
+app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, default_response_class=ORJSONResponse)
+
+# Compress larger JSON bodies (search hits, stats); small responses go out as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Mount routers
 app.include_router(health.router, tags=["health"])
@@ -12,3 +23,39 @@ app.include_router(chat.router, tags=["chat"])
 app.include_router(stats.router, tags=["stats"])
 app.include_router(embeddings.router, tags=["embeddings"])
 app.include_router(pdf.router, tags=["pdf"])
+
+
+@app.on_event("startup")
+async def start_background_tasks():
+    # Open the first pooled Redis connection now; a down cache shouldn't keep the API from starting
+    try:
+        await redis_client.ping()
+    except Exception as e:
+        logger.warning(f"Redis not reachable at startup: {e}")
+    # Fill the get_index cache now so the first search/ingest doesn't pay the lookup
+    try:
+        await asyncio.gather(
+            asyncio.to_thread(get_index, settings.MEILI_INDEX),
+            asyncio.to_thread(get_index, settings.CHUNKS_INDEX),
+        )
+    except Exception as e:
+        logger.warning(f"Meilisearch indexes not ready at startup: {e}")
+    app.state.stats_task = asyncio.create_task(stats.refresh_stats_loop())
+    embedder.start()
+
+
+@app.on_event("startup")
+async def warmup_pdf_processor():
+    await pdf_processor.warmup()
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    app.state.stats_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await app.state.stats_task
+    await embedder.stop()
+    shutdown_process_pool()
+    await http_client.aclose()
+    await redis_client.aclose()
+    await redis_bytes_client.aclose()
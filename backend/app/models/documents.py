@@ -1,7 +1,10 @@
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from pydantic import BaseModel, TypeAdapter
+from typing import Dict, Any, List, Optional
 
 class Document(BaseModel):
     id: str
     text: str
     metadata: Optional[Dict[str, Any]] = {}
+
+# Validates a raw JSON body straight into List[Document] in pydantic-core (no json.loads + dict pass)
+DocumentList = TypeAdapter(List[Document])
@@ -1,25 +1,39 @@
+import re
 from typing import List
 
+# Greedy match up to the last sentence terminator in the searched window (one scan, no slicing).
+# The terminator must be followed by whitespace, so "3.14" or "e.g.x" don't split. The search stops
+# one char past the window so that lookahead sees the real next char instead of the window edge.
+_LAST_SENT = re.compile(r'.*[.!?](?=\s)', re.DOTALL)
+
 
 def chunk_text(text: str, chunk_size: int = 512, overlap: int = 50) -> List[str]:
     """Split text into overlapping chunks (sentence-aware)."""
-    if len(text) <= chunk_size:
-        return [text]
+    n = len(text)
+    if n <= chunk_size:
+        # Fits in one chunk: skip the boundary loop, trimming only when an edge is whitespace
+        if n and (text[0].isspace() or text[-1].isspace()):
+            text = text.strip()
+        return [text] if text else []
 
     chunks, start = [], 0
-    while start < len(text):
+    while start < n:
         end = start + chunk_size
-        if end < len(text):
-            last_part = text[max(start, end - 100):end]
-            sentence_end = max(last_part.rfind('.'), last_part.rfind('!'), last_part.rfind('?'))
-            if sentence_end > -1:
-                end = max(start, end - 100) + sentence_end + 1
+        if end < n:
+            m = _LAST_SENT.match(text, max(start, end - 100), end + 1)
+            if m:
+                end = m.end()
 
-        chunk = text[start:end].strip()
-        if chunk:
-            chunks.append(chunk)
+        # Trim by index so each chunk is sliced once (strip() would copy it again)
+        a, b = start, min(end, n)
+        while a < b and text[a].isspace():
+            a += 1
+        while b > a and text[b - 1].isspace():
+            b -= 1
+        if a < b:
+            chunks.append(text[a:b])
         start = end - overlap
-        if start >= len(text):
+        if start >= n:
             break
 
     return chunks
@@ -0,0 +1,72 @@
+import asyncio
+import contextlib
+from typing import List, Optional, Tuple
+from app.services.embeddings import generate_embeddings
+
+
+class BatchingEmbedder:
+    """
+    Coalesce concurrent single-text embedding calls (search, RAG) into one
+    batched /v1/embeddings request, flushed after `window` seconds or `max_batch` texts.
+    """
+
+    def __init__(self, window: float = 0.01, max_batch: int = 32):
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the consumer task (called from app startup; embed() also starts it lazily)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+
+    async def embed(self, text: str) -> Optional[List[float]]:
+        """Embed one text; returns None when the embedding backend gave no vector."""
+        self.start()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, fut))
+        return await fut
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            vecs = await generate_embeddings([text for text, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        # generate_embeddings drops failed entries, so a short result can't be matched up
+        if len(vecs) != len(batch):
+            vecs = [None] * len(batch)
+        for (_, fut), vec in zip(batch, vecs):
+            if not fut.done():
+                fut.set_result(vec)
+
+
+embedder = BatchingEmbedder()
@@ -1,55 +1,84 @@
-import httpx
-from typing import List, Optional
+import asyncio
+from cachetools import LRUCache
+from typing import Dict, List, Optional
+from app.core.clients import http_client
 from app.core.config import settings
 from app.core.logging import logger
-from app.utils.hashing import md5_hash
-from app.utils.cache import get_json, set_json
+from app.utils.hashing import fast_hash
+from app.utils.cache import get_many_vectors, set_many_vectors
 
 _CACHE_TTL = 3600  # seconds
+_EMBED_SHARD = 64  # texts per /v1/embeddings request
+_EMBED_SEM = asyncio.Semaphore(8)  # concurrent shard requests to LiteLLM
+_L1: LRUCache = LRUCache(maxsize=4096)  # per-process hot set in front of Redis
+# Encoding is part of the key so switching EMBED_QUANT never misreads existing entries
+_KEY_PREFIX = "emb:i8:" if settings.EMBED_QUANT == "int8" else "emb:f32:"
 
-async def _request_embeddings(texts: List[str]) -> Optional[List[dict]]:
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        r = await client.post(
-            f"{settings.PROXY_URL}/v1/embeddings",
+async def _request_shard(texts: List[str]) -> Optional[List[dict]]:
+    async with _EMBED_SEM:
+        r = await http_client.post(
+            "/v1/embeddings",
             json={"model": "local-embeddings", "input": texts},
-            headers={"Content-Type": "application/json"}
+            headers={"Content-Type": "application/json"},
         )
-        if r.status_code != 200:
-            logger.error(f"Embedding request failed: {r.status_code} - {r.text}")
-            return None
-        return r.json().get("data", [])
+    if r.status_code != 200:
+        logger.error(f"Embedding request failed: {r.status_code} - {r.text}")
+        return None
+    data = r.json().get("data", [])
+    if len(data) != len(texts):
+        logger.error(f"Embedding request returned {len(data)} vectors for {len(texts)} texts")
+        return None
+    return data
+
+async def _request_embeddings(texts: List[str]) -> Optional[List[dict]]:
+    """Embed texts in fixed-size shards sent concurrently; None if any shard fails."""
+    shards = await asyncio.gather(*(
+        _request_shard(texts[i:i + _EMBED_SHARD]) for i in range(0, len(texts), _EMBED_SHARD)
+    ))
+    if any(shard is None for shard in shards):
+        return None
+    return [emb for shard in shards for emb in shard]
+
+async def probe_embeddings(text: str = "test") -> Optional[List[float]]:
+    """Embed one text straight through LiteLLM/TEI, bypassing the caches (for health checks)."""
+    data = await _request_embeddings([text])
+    return data[0].get("embedding") if data else None
 
 async def generate_embeddings(texts: List[str]) -> List[List[float]]:
     """
     Generate sentence embeddings via LiteLLM (TEI backend), with Redis cache.
-    Uses utils.hashing + utils.cache for keys & JSON storage.
+    Uses utils.hashing + utils.cache for keys & packed (float32 or int8) storage.
     """
-    results: List[Optional[List[float]]] = [None] * len(texts)
-    uncached, idxs = [], []
-
-    # 1) cache lookups
-    for i, t in enumerate(texts):
-        key = f"embedding:{md5_hash(t)}"
-        cached_vec = get_json(key)
-        if cached_vec is not None:
-            results[i] = cached_vec
-        else:
-            uncached.append(t)
-            idxs.append(i)
-
-    # 2) remote call if needed
-    if uncached:
-        data = await _request_embeddings(uncached)
+    keys = [f"{_KEY_PREFIX}{fast_hash(t)}" for t in texts]
+
+    # 1) cache lookups: in-process L1 first, then one MGET to Redis for the rest
+    results: List[Optional[List[float]]] = [_L1.get(key) for key in keys]
+    l1_misses = [i for i, v in enumerate(results) if v is None]
+    if l1_misses:
+        for i, vec in zip(l1_misses, await get_many_vectors([keys[i] for i in l1_misses], settings.EMBED_QUANT)):
+            if vec is not None:
+                results[i] = _L1[keys[i]] = vec
+    idxs = [i for i, v in enumerate(results) if v is None]
+
+    # 2) remote call if needed; duplicate texts (same key) are embedded once and scattered back
+    if idxs:
+        pending: Dict[str, List[int]] = {}
+        for i in idxs:
+            pending.setdefault(keys[i], []).append(i)
+        data = await _request_embeddings([texts[positions[0]] for positions in pending.values()])
         if data is None:
             # Fail closed: return only cached results
             return [v for v in results if v is not None]
 
-        for i, emb in zip(idxs, data):
+        fresh = {}
+        for (key, positions), emb in zip(pending.items(), data):
             vec = emb.get("embedding", emb)
             if isinstance(vec, dict) and "default" in vec:
                 vec = vec["default"]
-            results[i] = vec
-            set_json(f"embedding:{md5_hash(texts[i])}", vec, _CACHE_TTL)
+            for i in positions:
+                results[i] = vec
+            _L1[key] = fresh[key] = vec
+        await set_many_vectors(fresh, _CACHE_TTL, settings.EMBED_QUANT)
 
     # 3) flatten and filter
     return [v for v in results if v is not None]
@@ -1,6 +1,7 @@
-from datetime import datetime
-from typing import List, Dict, Any
-from app.core.clients import meili_client
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Tuple
+from app.core.clients import get_index
 from app.core.config import settings
 from app.core.logging import logger
 from app.models.documents import Document
@@ -8,45 +9,53 @@ from .chunking import chunk_text
 from .embeddings import generate_embeddings
 
 
-async def ingest_documents(documents: List[Document]) -> Dict[str, Any]:
-    """Ingest documents into Meilisearch with chunking + embeddings."""
-
-    doc_index = meili_client.get_index(settings.MEILI_INDEX)
-    chunks_index = meili_client.get_index(settings.CHUNKS_INDEX)
-
+def _build_chunks(documents: List[Document]) -> Tuple[List[dict], List[dict], List[str]]:
+    """Chunk documents and build the Meilisearch payloads (pure CPU work, run off the event loop)."""
     processed_docs, processed_chunks, all_chunk_texts = [], [], []
+    # One timestamp for the whole batch; every doc and chunk shares the string
+    indexed_at = datetime.now(timezone.utc).isoformat()
 
     for doc in documents:
         # Whole document
         proc_doc = {
             "id": doc.id,
             "text": doc.text,
-            "content": doc.text,
             **doc.metadata,
-            "indexed_at": datetime.now().isoformat(),
+            "indexed_at": indexed_at,
             "chunk_count": 0
         }
 
         # Chunks
         chunks = chunk_text(doc.text)
         proc_doc["chunk_count"] = len(chunks)
+        # Metadata tail is the same for every chunk of the doc: build it once, update() per chunk
+        chunk_meta = {**doc.metadata, "indexed_at": indexed_at}
         for i, content in enumerate(chunks):
-            chunk_id = f"{doc.id}-chunk-{i}"
             proc_chunk = {
-                "id": chunk_id,
+                "id": f"{doc.id}-chunk-{i}",
                 "text": content,
-                "content": content,
                 "document_id": doc.id,
                 "chunk_index": i,
-                "total_chunks": len(chunks),
-                **doc.metadata,
-                "indexed_at": datetime.now().isoformat()
+                "total_chunks": len(chunks)
             }
+            proc_chunk.update(chunk_meta)
             processed_chunks.append(proc_chunk)
             all_chunk_texts.append(content)
 
         processed_docs.append(proc_doc)
 
+    return processed_docs, processed_chunks, all_chunk_texts
+
+
+async def ingest_documents(documents: List[Document]) -> Dict[str, Any]:
+    """Ingest documents into Meilisearch with chunking + embeddings."""
+
+    doc_index, chunks_index, (processed_docs, processed_chunks, all_chunk_texts) = await asyncio.gather(
+        asyncio.to_thread(get_index, settings.MEILI_INDEX),
+        asyncio.to_thread(get_index, settings.CHUNKS_INDEX),
+        asyncio.to_thread(_build_chunks, documents),
+    )
+
     # Embeddings
     logger.info(f"Generating embeddings for {len(all_chunk_texts)} chunks...")
     embeddings = await generate_embeddings(all_chunk_texts)
@@ -59,14 +68,24 @@ async def ingest_documents(documents: List[Document]) -> Dict[str, Any]:
         for chunk in processed_chunks:
             chunk["_vectors"] = {"default": None}
 
-    # Insert into Meilisearch
-    doc_task = doc_index.add_documents(processed_docs)
-    chunk_task = chunks_index.add_documents(processed_chunks) if processed_chunks else None
+    # Insert into Meilisearch (sync client -> worker threads); chunks go in fixed-size batches
+    # so uploads overlap and no single request carries the whole ingest
+    batch = max(1, settings.INGEST_BATCH_SIZE)
+    doc_task, *chunk_tasks = await asyncio.gather(
+        asyncio.to_thread(doc_index.add_documents, processed_docs),
+        *(
+            asyncio.to_thread(chunks_index.add_documents, processed_chunks[i:i + batch])
+            for i in range(0, len(processed_chunks), batch)
+        ),
+    )
+    # Tasks are processed in uid order, so the highest one finishing means all chunks are in
+    chunk_task = max(chunk_tasks, key=lambda t: t.task_uid, default=None)
 
     return {
         "indexed": len(processed_docs),
         "chunks_created": len(processed_chunks),
         "embeddings_generated": len(embeddings),
         "document_task": doc_task,
-        "chunk_task": chunk_task
+        "chunk_task": chunk_task,
+        "chunk_tasks": chunk_tasks
     }
@@ -1,19 +1,75 @@
 from langchain.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
+from semantic_text_splitter import TextSplitter
+import asyncio
 import hashlib
-from typing import List
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
 import os
+from app.utils.cache import get_json, set_json
+from app.utils.hashing import fast_hash
+
+_POOL_WORKERS = os.cpu_count() or 1
+_process_pool: Optional[ProcessPoolExecutor] = None
+_PARSE_CACHE_TTL = 86400  # seconds; re-uploads of the same PDF skip parsing for a day
+# Rust splitter (paragraph > sentence > word boundaries); module-level because it can't be
+# pickled into the process pool, so each worker builds its own on import
+_text_splitter = TextSplitter(500, overlap=50)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the worker pool used for CPU-bound PDF parsing."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=_POOL_WORKERS)
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+def _warm_worker() -> None:
+    """No-op task; submitting one per slot forces every pool worker to start."""
+
+
+def _file_digest(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
 
 class PDFProcessor:
-    def __init__(self):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=500,
-            chunk_overlap=50,
-            separators=["\n\n", "\n", " ", ""]
-        )
-    
     async def process_pdf(self, file_path: str, metadata: dict = None) -> List[Document]:
+        """
+        Parse and split a PDF in a worker process so the event loop stays free.
+        Results are cached in Redis by file content + metadata, so duplicate uploads skip parsing.
+        """
+        digest = await asyncio.to_thread(_file_digest, file_path)
+        cache_key = f"pdf:v2:{digest}:{fast_hash(json.dumps(metadata or {}, sort_keys=True, default=str))}"
+        cached = await get_json(cache_key)
+        if cached is not None:
+            return [Document(page_content=c["page_content"], metadata=c["metadata"]) for c in cached]
+
+        loop = asyncio.get_running_loop()
+        chunks = await loop.run_in_executor(_get_process_pool(), self.process_pdf_sync, file_path, metadata)
+        await set_json(
+            cache_key,
+            [{"page_content": c.page_content, "metadata": c.metadata} for c in chunks],
+            _PARSE_CACHE_TTL,
+        )
+        return chunks
+
+    async def warmup(self) -> None:
+        """Start all parser processes up front so the first upload doesn't pay for forking them."""
+        loop = asyncio.get_running_loop()
+        pool = _get_process_pool()
+        await asyncio.gather(*(loop.run_in_executor(pool, _warm_worker) for _ in range(_POOL_WORKERS)))
+
+    def process_pdf_sync(self, file_path: str, metadata: dict = None) -> List[Document]:
         loader = PyPDFLoader(file_path)
         pages = loader.load()
         
@@ -26,9 +82,9 @@ class PDFProcessor:
         
         chunks = []
         for page_num, page in enumerate(pages):
-            page_chunks = self.text_splitter.split_text(page.page_content)
+            page_chunks = _text_splitter.chunks(page.page_content)
             for chunk_idx, chunk_text in enumerate(page_chunks):
-                chunk_id = hashlib.md5(f"{file_path}_{page_num}_{chunk_idx}".encode()).hexdigest()
+                chunk_id = fast_hash(f"{file_path}_{page_num}_{chunk_idx}")
                 chunks.append(Document(
                     page_content=chunk_text,
                     metadata={
@@ -39,3 +95,6 @@ class PDFProcessor:
                     }
                 ))
         return chunks
+
+
+pdf_processor = PDFProcessor()
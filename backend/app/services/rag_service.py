@@ -1,11 +1,15 @@
-from typing import Dict, Any, List
-from app.core.config import settings
-from app.core.clients import meili_client
+import asyncio
+from typing import Dict, Any, List, Optional
 from app.core.logging import logger
-from app.services.embeddings import generate_embeddings
+from app.services.embed_batcher import embedder
 from app.services.llm_service import generate_rag_answer
-from app.utils.hashing import md5_hash
-from app.utils.cache import get_json, set_json
+from app.services.search_service import search_chunk_index
+from app.utils.hashing import fast_hash
+from app.utils.cache import get_compressed_json, set_compressed_json
+
+_inflight: Dict[str, asyncio.Task] = {}
+# Hit fields that never go into a chunk's metadata (Meilisearch >=1.11 only sends _vectors on request)
+_NOT_METADATA = frozenset(("text", "content", "_vectors"))
 
 def _select_chunks(hits: List[dict], k: int) -> List[dict]:
     # Limit 2 chunks per document to keep context compact
@@ -22,38 +26,50 @@ def _select_chunks(hits: List[dict], k: int) -> List[dict]:
 
 async def rag_search(query: str, k: int, use_embeddings: bool = True) -> Dict[str, Any]:
     """Retrieve chunks (hybrid if available) and synthesize an answer via LLM. Cached 10 min."""
-    cache_key = f"rag:{md5_hash(f'{query}:{k}:{use_embeddings}')}"
-    cached = get_json(cache_key)
+    cache_key = f"rag:{fast_hash(f'{query}:{k}:{use_embeddings}')}"
+    if cache_key in _inflight:
+        return await asyncio.shield(_inflight[cache_key])
+
+    # Embed the query while the cache lookup is in flight; dropped again on a hit
+    emb_task = asyncio.create_task(embedder.embed(query)) if use_embeddings else None
+    try:
+        cached = await get_compressed_json(cache_key)
+    except BaseException:
+        if emb_task:
+            emb_task.cancel()
+        raise
     if cached:
-        cached["cached"] = True
-        return cached
+        if emb_task:
+            emb_task.cancel()
+        # The L1 tier hands every caller the same dict, so never mutate it
+        return {**cached, "cached": True}
+    if cache_key in _inflight:
+        # The same query started while our lookup was in flight
+        if emb_task:
+            emb_task.cancel()
+        return await asyncio.shield(_inflight[cache_key])
+
+    # Single-flight: identical queries arriving while this one runs await the same task. It is
+    # detached from this request, so a caller that disconnects doesn't cancel the others.
+    task = asyncio.create_task(_answer(query, k, use_embeddings, cache_key, emb_task))
+    _inflight[cache_key] = task
+    task.add_done_callback(lambda t: _finish_inflight(cache_key, t))
+    return await asyncio.shield(task)
 
-    chunks_index = meili_client.get_index(settings.CHUNKS_INDEX)
-    search_method = "text"
+def _finish_inflight(cache_key: str, task: asyncio.Task) -> None:
+    if _inflight.get(cache_key) is task:
+        del _inflight[cache_key]
+    if not task.cancelled():
+        task.exception()  # mark retrieved so a failure nobody awaited isn't logged at exit
 
-    # Try hybrid search with query vector
+async def _answer(query: str, k: int, use_embeddings: bool, cache_key: str, emb_task: Optional[asyncio.Task]) -> Dict[str, Any]:
+    qv = None
     if use_embeddings:
         try:
-            q_emb = await generate_embeddings([query])
-            if q_emb:
-                qv = q_emb[0]
-                res = chunks_index.search(
-                    query,
-                    {
-                        "vector": qv,
-                        "hybrid": {"semanticRatio": 0.8, "embedder": "default"},
-                        "limit": k * 2,
-                        "attributesToRetrieve": ["*"]
-                    }
-                )
-                search_method = "hybrid"
-            else:
-                res = chunks_index.search(query, {"limit": k * 2, "attributesToRetrieve": ["*"]})
+            qv = await emb_task
         except Exception as e:
-            logger.warning(f"Hybrid search failed, fallback to text. Error: {e}")
-            res = chunks_index.search(query, {"limit": k * 2, "attributesToRetrieve": ["*"]})
-    else:
-        res = chunks_index.search(query, {"limit": k * 2, "attributesToRetrieve": ["*"]})
+            logger.warning(f"Query embedding failed, fallback to text. Error: {e}")
+    res, search_method = await search_chunk_index(query, k * 2, qv)
 
     hits = res.get("hits", [])
     if not hits:
@@ -64,7 +80,7 @@ async def rag_search(query: str, k: int, use_embeddings: bool = True) -> Dict[st
             "cached": False,
             "search_method": search_method
         }
-        set_json(cache_key, {**result, "cached": False}, 600)
+        await set_compressed_json(cache_key, {**result, "cached": False}, 600)
         return result
 
     selected = _select_chunks(hits, k)
@@ -72,7 +88,7 @@ async def rag_search(query: str, k: int, use_embeddings: bool = True) -> Dict[st
     # Build LLM context + output chunk list
     context_parts, chunks = [], []
     for i, h in enumerate(selected):
-        content = h.get("content") or h.get("text", "")
+        content = h.get("text", "")
         title = h.get("title", h.get("metadata", {}).get("title", f"Chunk {i+1}"))
         doc_id = h.get("document_id", f"doc-{i}")
         idx = h.get("chunk_index", i)
@@ -84,7 +100,7 @@ async def rag_search(query: str, k: int, use_embeddings: bool = True) -> Dict[st
             "document_id": doc_id,
             "chunk_index": idx,
             "content": content[:300] + "..." if len(content) > 300 else content,
-            "metadata": {k: v for k, v in h.items() if k not in ["text", "content", "_vectors"]}
+            "metadata": {k: v for k, v in h.items() if k not in _NOT_METADATA}
         })
 
     if not chunks:
@@ -95,7 +111,7 @@ async def rag_search(query: str, k: int, use_embeddings: bool = True) -> Dict[st
             "cached": False,
             "search_method": search_method
         }
-        set_json(cache_key, {**result, "cached": False}, 600)
+        await set_compressed_json(cache_key, {**result, "cached": False}, 600)
         return result
 
     context = "\n".join(context_parts)
@@ -108,5 +124,5 @@ async def rag_search(query: str, k: int, use_embeddings: bool = True) -> Dict[st
         "cached": False,
         "search_method": search_method
     }
-    set_json(cache_key, {**result, "cached": False}, 600)
+    await set_compressed_json(cache_key, {**result, "cached": False}, 600)
     return result
@@ -1,46 +1,82 @@
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import HTTPException
-from app.core.clients import meili_client
+from app.core.clients import get_index
 from app.core.config import settings
-from app.services.embeddings import generate_embeddings
+from app.services.embed_batcher import embedder
 from app.core.logging import logger
 
+_SEMANTIC_ONLY = {"semanticRatio": 1.0, "embedder": "default"}
+_RRF_K = 60
+_HIGHLIGHT = ["text"]
+
+
+def search_index(uid: str, query: str, opts: Dict[str, Any]) -> Dict[str, Any]:
+    """Blocking Meilisearch search; call through asyncio.to_thread from handlers."""
+    return get_index(uid).search(query, opts)
+
 
 async def search_documents(query: str, k: int) -> Dict[str, Any]:
     """Text search on documents index."""
     if not query.strip():
         raise HTTPException(422, "Query cannot be empty")
-    index = meili_client.get_index(settings.MEILI_INDEX)
-    res = index.search(query, {"limit": k, "attributesToRetrieve": ["*"], "attributesToHighlight": ["text", "content"]})
+    res = await asyncio.to_thread(search_index, settings.MEILI_INDEX, query, {"limit": k, "attributesToRetrieve": ["*"], "attributesToHighlight": _HIGHLIGHT})
     return {"hits": res["hits"], "total": res["estimatedTotalHits"], "index_used": "documents", "search_method": "text"}
 
 
+def _rrf(*hit_lists: List[dict], k: int = _RRF_K) -> List[dict]:
+    """Reciprocal-rank fusion: score each hit by sum(1 / (k + rank)) across lists; first copy of a hit wins."""
+    scores: Dict[str, float] = {}
+    hits_by_id: Dict[str, dict] = {}
+    for hits in hit_lists:
+        for rank, hit in enumerate(hits, 1):
+            scores[hit["id"]] = scores.get(hit["id"], 0.0) + 1.0 / (k + rank)
+            hits_by_id.setdefault(hit["id"], hit)
+    return [hits_by_id[i] for i in sorted(scores, key=scores.__getitem__, reverse=True)]
+
+
+async def search_chunk_index(query: str, limit: int, query_vec: Optional[List[float]] = None, highlight: bool = False) -> Tuple[Dict[str, Any], str]:
+    """
+    Search the chunks index. With a query vector, runs a pure vector search and a text search in
+    parallel and fuses them with RRF (rank-based, so cosine and BM25 scales never get mixed);
+    otherwise, or if the vector search fails, text only. Returns the response and the method used.
+    """
+    text_opts = {"limit": limit, "attributesToRetrieve": ["*"]}
+    if highlight:
+        text_opts["attributesToHighlight"] = _HIGHLIGHT
+    if query_vec is None:
+        return await asyncio.to_thread(search_index, settings.CHUNKS_INDEX, query, text_opts), "text"
+
+    candidates = limit * 2
+    vec_opts = {"vector": query_vec, "hybrid": _SEMANTIC_ONLY, "limit": candidates, "attributesToRetrieve": ["*"]}
+    vec_res, txt_res = await asyncio.gather(
+        asyncio.to_thread(search_index, settings.CHUNKS_INDEX, "", vec_opts),
+        asyncio.to_thread(search_index, settings.CHUNKS_INDEX, query, {**text_opts, "limit": candidates}),
+        return_exceptions=True,
+    )
+    if isinstance(txt_res, BaseException):
+        raise txt_res
+    if isinstance(vec_res, BaseException):
+        logger.warning(f"Vector search failed: {vec_res}, fallback to text")
+        return {**txt_res, "hits": txt_res["hits"][:limit]}, "text"
+
+    # Text hits first so highlighted copies are the ones kept
+    fused = _rrf(txt_res["hits"], vec_res["hits"])[:limit]
+    total = max(txt_res.get("estimatedTotalHits", 0), vec_res.get("estimatedTotalHits", 0))
+    return {"hits": fused, "estimatedTotalHits": total}, "hybrid"
+
+
 async def search_chunks(query: str, k: int, use_embeddings: bool = True) -> Dict[str, Any]:
     """Chunk search with optional hybrid (vector+text) mode."""
     if not query.strip():
         raise HTTPException(422, "Query cannot be empty")
 
-    chunks_index = meili_client.get_index(settings.CHUNKS_INDEX)
-    search_method = "text"
-
+    query_vec = None
     if use_embeddings:
         try:
-            emb = await generate_embeddings([query])
-            if emb:
-                query_vec = emb[0]
-                if isinstance(query_vec, dict) and "default" in query_vec:
-                    query_vec = query_vec["default"]
-
-                res = chunks_index.search(query, {
-                    "vector": query_vec,
-                    "hybrid": {"semanticRatio": 0.8, "embedder": "default"},
-                    "limit": k,
-                    "attributesToRetrieve": ["*"]
-                })
-                search_method = "hybrid"
-                return {"hits": res["hits"], "total": res["estimatedTotalHits"], "index_used": "chunks", "search_method": search_method}
+            query_vec = await embedder.embed(query)
         except Exception as e:
-            logger.warning(f"Vector search failed: {e}, fallback to text")
+            logger.warning(f"Query embedding failed: {e}, fallback to text")
 
-    res = chunks_index.search(query, {"limit": k, "attributesToRetrieve": ["*"], "attributesToHighlight": ["text", "content"]})
-    return {"hits": res["hits"], "total": res["estimatedTotalHits"], "index_used": "chunks", "search_method": "text"}
+    res, search_method = await search_chunk_index(query, k, query_vec, highlight=True)
+    return {"hits": res["hits"], "total": res["estimatedTotalHits"], "index_used": "chunks", "search_method": search_method}
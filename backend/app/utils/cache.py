@@ -1,17 +1,88 @@
-import json
-from typing import Any, Optional
-from app.core.clients import redis_client
+import numpy as np
+import orjson
+import zstandard as zstd
+from cachetools import TTLCache
+from typing import Any, Dict, List, Optional
+from app.core.clients import redis_bytes_client, redis_client
 
-def get_json(key: str) -> Optional[Any]:
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_COMPRESS_MIN_BYTES = 1024  # smaller payloads aren't worth the codec overhead
+_zc = zstd.ZstdCompressor(level=3)
+_zd = zstd.ZstdDecompressor()
+# In-process L1 in front of Redis for JSON values; the short TTL keeps it under every caller's
+# Redis TTL and bounds how stale one worker can be relative to the others
+_L1_TTL = 60  # seconds
+_l1: TTLCache = TTLCache(maxsize=2048, ttl=_L1_TTL)
+
+async def get_json(key: str) -> Optional[Any]:
     """Get a JSON object from Redis by key."""
-    val = redis_client.get(key)
+    if (hit := _l1.get(key)) is not None:
+        return hit
+    val = await redis_client.get(key)
     if val is None:
         return None
     try:
-        return json.loads(val)
+        _l1[key] = value = orjson.loads(val)
+        return value
     except Exception:
         return None
 
-def set_json(key: str, value: Any, ttl_seconds: int) -> None:
+async def set_json(key: str, value: Any, ttl_seconds: int) -> None:
     """Set a JSON-serializable value with TTL."""
-    redis_client.setex(key, ttl_seconds, json.dumps(value))
+    await redis_client.setex(key, ttl_seconds, orjson.dumps(value))
+    _l1[key] = value
+
+async def get_compressed_json(key: str) -> Optional[Any]:
+    """Get a JSON value written by set_compressed_json (zstd frames are detected by magic number)."""
+    if (hit := _l1.get(key)) is not None:
+        return hit
+    buf = await redis_bytes_client.get(key)
+    if buf is None:
+        return None
+    try:
+        if buf.startswith(_ZSTD_MAGIC):
+            buf = _zd.decompress(buf)
+        _l1[key] = value = orjson.loads(buf)
+        return value
+    except Exception:
+        return None
+
+async def set_compressed_json(key: str, value: Any, ttl_seconds: int) -> None:
+    """Set a JSON value with TTL, zstd-compressed when it is large enough to benefit."""
+    raw = orjson.dumps(value)
+    if len(raw) > _COMPRESS_MIN_BYTES:
+        raw = _zc.compress(raw)
+    await redis_bytes_client.setex(key, ttl_seconds, raw)
+    _l1[key] = value
+
+def _pack_vector(vec: List[float], quant: str) -> bytes:
+    arr = np.asarray(vec, dtype="<f4")
+    if quant == "int8":
+        # 4-byte float32 scale header, then one signed byte per dimension
+        scale = float(np.max(np.abs(arr))) or 1.0
+        return np.asarray(scale, dtype="<f4").tobytes() + np.round(arr / scale * 127).astype(np.int8).tobytes()
+    return arr.tobytes()
+
+def _unpack_vector(buf: bytes, quant: str) -> List[float]:
+    if quant == "int8":
+        scale = float(np.frombuffer(buf, dtype="<f4", count=1)[0])
+        return (np.frombuffer(buf, dtype=np.int8, offset=4).astype(np.float32) * (scale / 127)).tolist()
+    return np.frombuffer(buf, dtype="<f4").tolist()
+
+async def get_many_vectors(keys: List[str], quant: str = "f32") -> List[Optional[List[float]]]:
+    """Fetch packed vectors in one MGET; missing keys come back as None."""
+    if not keys:
+        return []
+    return [
+        _unpack_vector(buf, quant) if buf is not None else None
+        for buf in await redis_bytes_client.mget(keys)
+    ]
+
+async def set_many_vectors(items: Dict[str, List[float]], ttl_seconds: int, quant: str = "f32") -> None:
+    """Store vectors as packed float32 (or scaled int8) bytes in one pipelined round-trip."""
+    if not items:
+        return
+    pipe = redis_bytes_client.pipeline(transaction=False)
+    for key, vec in items.items():
+        pipe.setex(key, ttl_seconds, _pack_vector(vec, quant))
+    await pipe.execute()
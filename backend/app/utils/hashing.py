@@ -1,5 +1,7 @@
-import hashlib
+from functools import lru_cache
+from blake3 import blake3
 
-def md5_hash(text: str) -> str:
-    """Deterministic MD5 hash for cache keys, UTF-8 safe."""
-    return hashlib.md5(text.encode("utf-8")).hexdigest()
+@lru_cache(maxsize=8192)  # boilerplate chunks and repeated queries hash once per process
+def fast_hash(text: str) -> str:
+    """128-bit BLAKE3 hex digest for cache keys and ids (SIMD-accelerated, much faster than MD5)."""
+    return blake3(text.encode("utf-8")).hexdigest(length=16)
@@ -1,121 +1,160 @@
 import os
+import sys
 import httpx
-import hashlib
-from typing import Iterable, Dict, Any
+import orjson
+from blake3 import blake3
+from types import MappingProxyType
+from typing import AsyncIterator, Iterable, Dict, Any, List, Mapping, Tuple
 
 API_URL = os.getenv("API_URL", "http://backend:8000")
 
 
-def iter_docs() -> Iterable[Dict[str, Any]]:
-    """Create sample documents with more detailed content"""
-    documents = [
-        {
-            "id": "meilisearch-guide", 
-            "text": "Meilisearch is a powerful, fast, and easy-to-use search engine built for modern applications. It supports both traditional full-text search with BM25 ranking and modern vector search capabilities for semantic similarity matching. Meilisearch provides instant search results with typo tolerance, filtering, faceting, and geo-search features. It can handle millions of documents while maintaining sub-millisecond response times.",
-            "metadata": {
-                "title": "Meilisearch Search Engine Guide",
-                "source": "meilisearch-docs.md",
-                "category": "search-technology",
-                "tags": ["search", "database", "full-text"],
-                "sha": "meili123"
-            }
-        },
-        {
-            "id": "tei-embeddings-guide",
-            "text": "Text Embeddings Inference (TEI) is a comprehensive toolkit for deploying and serving Large Language Model embeddings in production environments. TEI enables high-performance extraction of sentence embeddings from text input, making it ideal for semantic search, recommendation systems, and similarity matching applications. The toolkit supports popular embedding models like sentence-transformers and can run efficiently on both CPU and GPU hardware using optimized implementations from Hugging Face.",
-            "metadata": {
-                "title": "TEI Embeddings Service Guide", 
-                "source": "tei-docs.md",
-                "category": "ai-ml",
-                "tags": ["embeddings", "ai", "nlp", "huggingface"],
-                "sha": "tei456"
-            }
-        },
-        {
-            "id": "litellm-proxy-guide",
-            "text": "LiteLLM Proxy is a unified interface for multiple language models that simplifies AI application development. It provides a consistent API that can route requests to different LLM providers like Groq, OpenAI, Anthropic, and others, making it easy to switch between providers without changing application code. LiteLLM includes features like load balancing, fallback mechanisms, cost tracking, and request caching. For embeddings, it can be configured to route requests to Text Embeddings Inference (TEI) servers running locally or in the cloud.",
-            "metadata": {
-                "title": "LiteLLM Proxy Integration Guide",
-                "source": "litellm-docs.md", 
-                "category": "ai-infrastructure",
-                "tags": ["llm", "proxy", "api", "integration"],
-                "sha": "lite789"
-            }
-        },
-        {
-            "id": "rag-architecture-guide",
-            "text": "Retrieval-Augmented Generation (RAG) is a powerful AI architecture that combines information retrieval with language generation. RAG systems work by first retrieving relevant documents or passages from a knowledge base using semantic search, then using those retrieved documents as context for a large language model to generate accurate, grounded responses. This approach helps reduce hallucinations and provides more factual, up-to-date information compared to using LLMs alone.",
-            "metadata": {
-                "title": "RAG Architecture Overview",
-                "source": "rag-guide.md",
-                "category": "ai-architecture", 
-                "tags": ["rag", "ai", "retrieval", "generation"],
-                "sha": "rag101"
-            }
-        },
-        {
-            "id": "docker-deployment-guide",
-            "text": "Docker containerization provides isolated, reproducible environments for deploying complex applications. With Docker Compose, you can orchestrate multi-service applications using simple YAML configuration files. This makes it easy to deploy RAG pipelines with multiple components like search engines, embedding services, and API backends. Docker ensures consistent deployment across different environments while simplifying scaling and maintenance.",
-            "metadata": {
-                "title": "Docker Deployment Best Practices",
-                "source": "docker-guide.md",
-                "category": "devops",
-                "tags": ["docker", "deployment", "containers", "orchestration"],
-                "sha": "dock999"
-            }
+def _freeze(doc: Dict[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of a sample doc (tags as a tuple), filling in a computed sha if not provided"""
+    meta = dict(doc["metadata"], tags=tuple(doc["metadata"]["tags"]))
+    if not meta.get("sha"):
+        meta["sha"] = blake3(doc["text"].encode()).hexdigest(length=8)  # 16 hex chars, as before
+    return MappingProxyType({**doc, "metadata": MappingProxyType(meta)})
+
+
+# Sample documents with more detailed content, built and frozen once at import
+_DOCUMENTS: Tuple[Mapping[str, Any], ...] = tuple(map(_freeze, (
+    {
+        "id": "meilisearch-guide", 
+        "text": "Meilisearch is a powerful, fast, and easy-to-use search engine built for modern applications. It supports both traditional full-text search with BM25 ranking and modern vector search capabilities for semantic similarity matching. Meilisearch provides instant search results with typo tolerance, filtering, faceting, and geo-search features. It can handle millions of documents while maintaining sub-millisecond response times.",
+        "metadata": {
+            "title": "Meilisearch Search Engine Guide",
+            "source": "meilisearch-docs.md",
+            "category": "search-technology",
+            "tags": ["search", "database", "full-text"],
+            "sha": "meili123"
         }
-    ]
-    
-    for doc in documents:
-        # Add computed hash if not provided
-        if not doc["metadata"].get("sha"):
-            doc["metadata"]["sha"] = hashlib.sha256(doc["text"].encode()).hexdigest()[:16]
-        yield doc
+    },
+    {
+        "id": "tei-embeddings-guide",
+        "text": "Text Embeddings Inference (TEI) is a comprehensive toolkit for deploying and serving Large Language Model embeddings in production environments. TEI enables high-performance extraction of sentence embeddings from text input, making it ideal for semantic search, recommendation systems, and similarity matching applications. The toolkit supports popular embedding models like sentence-transformers and can run efficiently on both CPU and GPU hardware using optimized implementations from Hugging Face.",
+        "metadata": {
+            "title": "TEI Embeddings Service Guide", 
+            "source": "tei-docs.md",
+            "category": "ai-ml",
+            "tags": ["embeddings", "ai", "nlp", "huggingface"],
+            "sha": "tei456"
+        }
+    },
+    {
+        "id": "litellm-proxy-guide",
+        "text": "LiteLLM Proxy is a unified interface for multiple language models that simplifies AI application development. It provides a consistent API that can route requests to different LLM providers like Groq, OpenAI, Anthropic, and others, making it easy to switch between providers without changing application code. LiteLLM includes features like load balancing, fallback mechanisms, cost tracking, and request caching. For embeddings, it can be configured to route requests to Text Embeddings Inference (TEI) servers running locally or in the cloud.",
+        "metadata": {
+            "title": "LiteLLM Proxy Integration Guide",
+            "source": "litellm-docs.md", 
+            "category": "ai-infrastructure",
+            "tags": ["llm", "proxy", "api", "integration"],
+            "sha": "lite789"
+        }
+    },
+    {
+        "id": "rag-architecture-guide",
+        "text": "Retrieval-Augmented Generation (RAG) is a powerful AI architecture that combines information retrieval with language generation. RAG systems work by first retrieving relevant documents or passages from a knowledge base using semantic search, then using those retrieved documents as context for a large language model to generate accurate, grounded responses. This approach helps reduce hallucinations and provides more factual, up-to-date information compared to using LLMs alone.",
+        "metadata": {
+            "title": "RAG Architecture Overview",
+            "source": "rag-guide.md",
+            "category": "ai-architecture", 
+            "tags": ["rag", "ai", "retrieval", "generation"],
+            "sha": "rag101"
+        }
+    },
+    {
+        "id": "docker-deployment-guide",
+        "text": "Docker containerization provides isolated, reproducible environments for deploying complex applications. With Docker Compose, you can orchestrate multi-service applications using simple YAML configuration files. This makes it easy to deploy RAG pipelines with multiple components like search engines, embedding services, and API backends. Docker ensures consistent deployment across different environments while simplifying scaling and maintenance.",
+        "metadata": {
+            "title": "Docker Deployment Best Practices",
+            "source": "docker-guide.md",
+            "category": "devops",
+            "tags": ["docker", "deployment", "containers", "orchestration"],
+            "sha": "dock999"
+        }
+    }
+)))
+
+
+def iter_docs() -> Iterable[Mapping[str, Any]]:
+    """Iterate the sample documents (shared read-only mappings)"""
+    return iter(_DOCUMENTS)
+
+
+async def _json_array(items: Iterable[Mapping[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode items as a JSON array one document at a time (chunked upload, no full-body buffer)"""
+    sep = b"["
+    for item in items:
+        # orjson has no native MappingProxyType support; default=dict covers it at any depth
+        yield sep + orjson.dumps(item, default=dict)
+        sep = b","
+    yield b"]" if sep == b"," else b"[]"
+
+
+async def _ingest_http(payload: List[Mapping[str, Any]]) -> Dict[str, Any]:
+    """POST the documents to the backend's /ingest endpoint"""
+    async with httpx.AsyncClient(timeout=120) as client:
+        print(f"📤 Sending documents to {API_URL}/ingest...")
+        async with client.stream(
+            "POST",
+            f"{API_URL}/ingest",
+            content=_json_array(payload),
+            headers={"Content-Type": "application/json"},
+        ) as res:
+            await res.aread()
+            res.raise_for_status()
+            return res.json()
+
+
+async def _ingest_inproc(payload: List[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Run the backend ingestion pipeline in this process (API_URL=inproc://): no HTTP, no JSON"""
+    # Imported lazily: the app reads its settings from the environment on import
+    from app.core.clients import http_client, redis_client, redis_bytes_client
+    from app.models.documents import DocumentList
+    from app.services.ingestion import ingest_documents
+
+    print("📤 Ingesting documents in-process...")
+    try:
+        return await ingest_documents(DocumentList.validate_python(payload))
+    finally:
+        await http_client.aclose()
+        await redis_client.aclose()
+        await redis_bytes_client.aclose()
 
 
 async def main():
     """Ingest sample documents into the RAG system"""
     print("🚀 Starting document ingestion...")
     
-    items = list(iter_docs())
-    print(f"📄 Prepared {len(items)} documents for ingestion")
+    # iter_docs already yields {id, text, metadata}, so the list is the payload as-is
+    payload = list(iter_docs())
+    print(f"📄 Prepared {len(payload)} documents for ingestion")
     
-    async with httpx.AsyncClient(timeout=120) as client:
-        try:
-            # Ingest documents using the working endpoint
-            payload = [
-                {
-                    "id": doc["id"], 
-                    "text": doc["text"], 
-                    "metadata": doc["metadata"]
-                } 
-                for doc in items
-            ]
-            
-            print(f"📤 Sending documents to {API_URL}/ingest...")
-            res = await client.post(f"{API_URL}/ingest", json=payload)
-            res.raise_for_status()
-            result = res.json()
-            
-            print(f"✅ Successfully ingested {result.get('indexed', 0)} documents!")
-            
-            # Show what was ingested
-            print("\n📋 Ingested documents:")
-            for doc in items:
-                print(f"   • {doc['id']}: {doc['metadata']['title']}")
-                
-            print(f"\n🔍 You can now search these documents using:")
-            print(f"   • API: POST {API_URL.replace('backend:8000', 'localhost:18000')}/search")
-            print(f"   • Web UI: http://localhost:18000/docs")
+    inproc = API_URL.startswith("inproc://")
+    try:
+        # Ingest documents using the working endpoint, or the pipeline directly when in-process
+        result = await (_ingest_inproc(payload) if inproc else _ingest_http(payload))
+        
+        print(f"✅ Successfully ingested {result.get('indexed', 0)} documents!")
+        
+        # Show what was ingested
+        print("\n📋 Ingested documents:")
+        sys.stdout.writelines(f"   • {doc['id']}: {doc['metadata']['title']}\n" for doc in payload)
             
-        except httpx.HTTPStatusError as e:
-            print(f"❌ HTTP Error {e.response.status_code}: {e.response.text}")
-            raise
-        except Exception as e:
-            print(f"❌ Error during ingestion: {e}")
-            raise
+        public_url = "http://localhost:18000" if inproc else API_URL.replace('backend:8000', 'localhost:18000')
+        print(f"\n🔍 You can now search these documents using:")
+        print(f"   • API: POST {public_url}/search")
+        print(f"   • Web UI: http://localhost:18000/docs")
+        
+    except httpx.HTTPStatusError as e:
+        print(f"❌ HTTP Error {e.response.status_code}: {e.response.text}")
+        raise
+    except Exception as e:
+        print(f"❌ Error during ingestion: {e}")
+        raise
 
 
 if __name__ == "__main__":
     import anyio
-    anyio.run(main)
+    anyio.run(main, backend_options={"use_uvloop": True})  # uvloop ships with uvicorn[standard]
@@ -17,7 +17,7 @@ curl -v -X POST "$API/indexes" \
   -H "Content-Type: application/json" \
   -d '{"uid":"chunks","primaryKey":"id"}' || true
 
-JSON_PAYLOAD="{\"embedders\":{\"default\":{\"source\":\"userProvided\",\"dimensions\":$DIM}},\"searchableAttributes\":[\"content\",\"title\"],\"displayedAttributes\":[\"id\",\"content\",\"title\",\"metadata\",\"source\",\"tags\"],\"filterableAttributes\":[\"source\",\"tags\",\"metadata.sha\",\"metadata.lang\"],\"sortableAttributes\":[\"created_at\",\"updated_at\"]}"
+JSON_PAYLOAD="{\"embedders\":{\"default\":{\"source\":\"userProvided\",\"dimensions\":$DIM}},\"searchableAttributes\":[\"text\",\"title\"],\"displayedAttributes\":[\"id\",\"text\",\"title\",\"document_id\",\"chunk_index\",\"metadata\",\"source\",\"tags\"],\"filterableAttributes\":[\"source\",\"tags\",\"metadata.sha\",\"metadata.lang\"],\"sortableAttributes\":[\"created_at\",\"updated_at\"]}"
 
 curl -v -X PATCH "$API/indexes/documents/settings" \
   -H "Authorization: Bearer $KEY" \
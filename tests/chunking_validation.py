@@ -13,10 +13,130 @@ Validates that the new chunking functionality is working correctly:
 import asyncio
 import httpx
 import json
+import os
+import sys
 import time
+from typing import List
+
+# chunk_text is checked in-process: /app in the backend container, backend/ in a checkout
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [_ROOT, os.path.join(_ROOT, "backend")]
+from app.services.chunking import chunk_text
 
 API_URL = "http://backend:8000"
 
+def _check_decimal_at_window_edge() -> bool:
+    """A '.' on the last char of a chunk window is only a sentence end if whitespace follows it"""
+    filler = "Chunk boundaries must respect sentences. "
+    lead = "Pi is roughly 3"
+    head = (filler * 20)[:511 - len(lead) - 1] + " "
+    text = head + lead + ".14 and that is all. " + filler * 10
+    assert text[511] == "."  # the decimal point sits on the edge of the first 512-char window
+    return not any(chunk.endswith("3.") for chunk in chunk_text(text))
+
+async def _wait_for_chunks(client: httpx.AsyncClient, doc_id: str) -> bool:
+    """Poll a text-only chunk search with backoff until doc_id shows up (~6s budget)"""
+    for delay in (0.1, 0.2, 0.4, 0.8, 1.6, 3.2):
+        try:
+            res = await client.post(f"{API_URL}/search-chunks",
+                json={"query": "chunking validation", "k": 10, "use_embeddings": False})
+            if res.status_code == 200 and any(
+                hit.get("document_id") == doc_id for hit in res.json().get("hits", [])
+            ):
+                return True
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(delay)
+    return False
+
+async def _index_stats(client: httpx.AsyncClient) -> List[str]:
+    """3. Index Statistics"""
+    out = ["\n3️⃣  Index Statistics\n"]
+    try:
+        stats_response = await client.get(f"{API_URL}/stats")
+        if stats_response.status_code == 200:
+            stats_data = stats_response.json()
+            out.append(f"   📄 Documents Index: {stats_data.get('documents', {}).get('count', 0)} documents\n")
+            out.append(f"   🧩 Chunks Index: {stats_data.get('chunks', {}).get('count', 0)} chunks\n")
+        else:
+            out.append(f"   ⚠️  Stats endpoint error: {stats_response.status_code}\n")
+    except Exception as e:
+        out.append(f"   ⚠️  Stats check failed: {e}\n")
+    return out
+
+async def _chunk_search(client: httpx.AsyncClient) -> List[str]:
+    """4. Direct Chunk Search"""
+    out = ["\n4️⃣  Direct Chunk Search Test\n"]
+    try:
+        chunk_search_response = await client.post(f"{API_URL}/search-chunks", 
+            json={"query": "chunking validation", "k": 3})
+        chunk_data = chunk_search_response.json()
+        
+        chunks_found = len(chunk_data.get('hits', []))
+        total_chunks = chunk_data.get('total', 0)
+        index_used = chunk_data.get('index_used', 'unknown')
+        
+        out.append(f"   ✅ Index Used: {index_used}\n")
+        out.append(f"   ✅ Total Chunks Available: {total_chunks}\n")
+        out.append(f"   ✅ Chunks Returned: {chunks_found}\n")
+        
+        if chunks_found > 0:
+            # Show first chunk details
+            first_chunk = chunk_data['hits'][0]
+            chunk_id = first_chunk.get('id', 'N/A')
+            document_id = first_chunk.get('document_id', 'N/A')
+            chunk_index = first_chunk.get('chunk_index', 'N/A')
+            content_preview = first_chunk.get('text', '')[:100] + "..."
+            
+            out.append(f"   📄 First Chunk ID: {chunk_id}\n")
+            out.append(f"   📄 Parent Document: {document_id}\n")
+            out.append(f"   📄 Chunk Index: {chunk_index}\n")
+            out.append(f"   📄 Content Preview: {content_preview}\n")
+        
+    except Exception as e:
+        out.append(f"   ❌ Chunk Search Failed: {e}\n")
+    return out
+
+async def _rag_search(client: httpx.AsyncClient) -> List[str]:
+    """5. RAG Search Using Chunks (queries sent concurrently, reported in order)"""
+    out = ["\n5️⃣  RAG Search Using Chunks\n"]
+    try:
+        rag_queries = [
+            "What is the purpose of chunking in RAGOPS?",
+            "How does the chunking process work?", 
+            "What are the benefits of using chunks?"
+        ]
+        
+        rag_responses = await asyncio.gather(*(
+            client.post(f"{API_URL}/search", json={"query": query, "k": 3}) for query in rag_queries
+        ))
+        for query, rag_response in zip(rag_queries, rag_responses):
+            out.append(f"\n   Query: {query}\n")
+            rag_data = rag_response.json()
+            
+            answer = rag_data.get('answer', '')
+            chunks_found = len(rag_data.get('chunks', []))
+            total_chunks = rag_data.get('total_chunks_found', 0)
+            cached = rag_data.get('cached', False)
+            
+            out.append(f"   ✅ Chunks Found: {chunks_found}\n")
+            out.append(f"   ✅ Total Available: {total_chunks}\n")
+            out.append(f"   ✅ Answer Generated: {'Yes' if len(answer) > 50 else 'No'}\n")
+            out.append(f"   ✅ Cached: {cached}\n")
+            
+            if chunks_found > 0:
+                # Show chunk info
+                first_chunk = rag_data['chunks'][0]
+                chunk_id = first_chunk.get('id', 'N/A')
+                doc_id = first_chunk.get('document_id', 'N/A')
+                out.append(f"   📄 First Chunk: {chunk_id} from {doc_id}\n")
+            
+            out.append(f"   💬 Answer Preview: {answer[:150]}...\n")
+            
+    except Exception as e:
+        out.append(f"   ❌ RAG Search Failed: {e}\n")
+    return out
+
 async def validate_chunking():
     """Comprehensive chunking validation"""
     print("🔍 RAGOPS Phase 1 Chunking Validation")
@@ -34,6 +154,11 @@ async def validate_chunking():
             print(f"   ❌ Health Check Failed: {e}")
             return
         
+        if _check_decimal_at_window_edge():
+            print("   ✅ Decimals at a chunk window edge stay intact")
+        else:
+            print("   ❌ A decimal at a chunk window edge was split")
+        
         # 2. Document Ingestion with Chunking
         print("\n2️⃣  Document Ingestion with Chunking")
         
@@ -64,112 +189,40 @@ async def validate_chunking():
             print(f"   ❌ Ingestion Failed: {e}")
             return
         
-        # Wait for indexing
+        # Wait for indexing: poll until the doc's chunks are searchable instead of a fixed sleep
         print("   ⏳ Waiting for indexing to complete...")
-        await asyncio.sleep(5)
+        if not await _wait_for_chunks(client, chunking_test_doc["id"]):
+            print("   ⚠️  Chunks not searchable yet, continuing anyway")
         
-        # 3. Index Statistics
-        print("\n3️⃣  Index Statistics")
-        try:
-            stats_response = await client.get(f"{API_URL}/stats")
-            if stats_response.status_code == 200:
-                stats_data = stats_response.json()
-                print(f"   📄 Documents Index: {stats_data.get('documents', {}).get('count', 0)} documents")
-                print(f"   🧩 Chunks Index: {stats_data.get('chunks', {}).get('count', 0)} chunks")
-            else:
-                print(f"   ⚠️  Stats endpoint error: {stats_response.status_code}")
-        except Exception as e:
-            print(f"   ⚠️  Stats check failed: {e}")
-        
-        # 4. Direct Chunk Search
-        print("\n4️⃣  Direct Chunk Search Test")
-        try:
-            chunk_search_response = await client.post(f"{API_URL}/search-chunks", 
-                json={"query": "chunking validation", "k": 3})
-            chunk_data = chunk_search_response.json()
-            
-            chunks_found = len(chunk_data.get('hits', []))
-            total_chunks = chunk_data.get('total', 0)
-            index_used = chunk_data.get('index_used', 'unknown')
-            
-            print(f"   ✅ Index Used: {index_used}")
-            print(f"   ✅ Total Chunks Available: {total_chunks}")
-            print(f"   ✅ Chunks Returned: {chunks_found}")
-            
-            if chunks_found > 0:
-                # Show first chunk details
-                first_chunk = chunk_data['hits'][0]
-                chunk_id = first_chunk.get('id', 'N/A')
-                document_id = first_chunk.get('document_id', 'N/A')
-                chunk_index = first_chunk.get('chunk_index', 'N/A')
-                content_preview = first_chunk.get('content', '')[:100] + "..."
-                
-                print(f"   📄 First Chunk ID: {chunk_id}")
-                print(f"   📄 Parent Document: {document_id}")
-                print(f"   📄 Chunk Index: {chunk_index}")
-                print(f"   📄 Content Preview: {content_preview}")
-            
-        except Exception as e:
-            print(f"   ❌ Chunk Search Failed: {e}")
-        
-        # 5. RAG Search Using Chunks
-        print("\n5️⃣  RAG Search Using Chunks")
-        try:
-            rag_queries = [
-                "What is the purpose of chunking in RAGOPS?",
-                "How does the chunking process work?", 
-                "What are the benefits of using chunks?"
-            ]
-            
-            for query in rag_queries:
-                print(f"\n   Query: {query}")
-                rag_response = await client.post(f"{API_URL}/search", 
-                    json={"query": query, "k": 3})
-                rag_data = rag_response.json()
-                
-                answer = rag_data.get('answer', '')
-                chunks_found = len(rag_data.get('chunks', []))
-                total_chunks = rag_data.get('total_chunks_found', 0)
-                cached = rag_data.get('cached', False)
-                
-                print(f"   ✅ Chunks Found: {chunks_found}")
-                print(f"   ✅ Total Available: {total_chunks}")
-                print(f"   ✅ Answer Generated: {'Yes' if len(answer) > 50 else 'No'}")
-                print(f"   ✅ Cached: {cached}")
-                
-                if chunks_found > 0:
-                    # Show chunk info
-                    first_chunk = rag_data['chunks'][0]
-                    chunk_id = first_chunk.get('id', 'N/A')
-                    doc_id = first_chunk.get('document_id', 'N/A')
-                    print(f"   📄 First Chunk: {chunk_id} from {doc_id}")
-                
-                print(f"   💬 Answer Preview: {answer[:150]}...")
-                
-        except Exception as e:
-            print(f"   ❌ RAG Search Failed: {e}")
+        # 3-5 only read what was indexed, so they run concurrently; each buffers its
+        # output and the sections are printed in order once all three finish
+        for lines in await asyncio.gather(_index_stats(client), _chunk_search(client), _rag_search(client)):
+            sys.stdout.writelines(lines)
         
         # 6. Performance Comparison
         print("\n6️⃣  Performance Analysis")
         try:
             test_query = "chunking functionality benefits"
             
+            # Warm the connection pool so neither timing pays connection setup
+            await client.get(f"{API_URL}/health")
+            
             # Test document search
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             doc_response = await client.post(f"{API_URL}/search-direct", 
                 json={"query": test_query, "k": 3})
-            doc_time = time.time() - start_time
+            doc_ms = (time.perf_counter_ns() - start_ns) / 1e6
             doc_data = doc_response.json()
             
             # Test chunk search  
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             chunk_response = await client.post(f"{API_URL}/search-chunks",
                 json={"query": test_query, "k": 3})
-            chunk_time = time.time() - start_time
+            chunk_ms = (time.perf_counter_ns() - start_ns) / 1e6
             chunk_data = chunk_response.json()
             
-            print(f"   📄 Document Search: {len(doc_data.get('hits', []))} hits in {doc_time:.3f}s")
-            print(f"   🧩 Chunk Search: {len(chunk_data.get('hits', []))} hits in {chunk_time:.3f}s")
+            print(f"   📄 Document Search: {len(doc_data.get('hits', []))} hits in {doc_ms:.2f}ms")
+            print(f"   🧩 Chunk Search: {len(chunk_data.get('hits', []))} hits in {chunk_ms:.2f}ms")
             
         except Exception as e:
             print(f"   ⚠️  Performance test failed: {e}")